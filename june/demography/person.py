@@ -39,6 +39,9 @@ class Person(dataobject):
     vaccinated: bool = False
     # comorbidity
     comorbidity: str = None
+    # integer sex code (0 male, 1 female) cached at construction so hot
+    # loops can index tables without string lookups
+    sex_code: int = 1
     # commute
     mode_of_transport: "ModeOfTransport" = None
     # activities
@@ -64,6 +67,7 @@ class Person(dataobject):
         return Person(
             id=id,
             sex=sex,
+            sex_code=0 if sex == "m" else 1,
             age=age,
             ethnicity=ethnicity,
             # IMPORTANT, these objects need to be recreated, otherwise the default
@@ -162,7 +162,14 @@ class HospitalDistributor:
     def assign_closest_hospitals_to_super_areas(self, super_areas):
         if not self.hospitals.members:
             return
-        for super_area in super_areas:
-            super_area.closest_hospitals = self.hospitals.get_closest_hospitals(
-                super_area.coordinates, self.hospitals.neighbour_hospitals
-            )
+        super_areas = list(super_areas)
+        coordinates = np.array(
+            [super_area.coordinates for super_area in super_areas], dtype=np.float64
+        )
+        neighbours = self.hospitals.get_closest_hospitals_batch(
+            coordinates, self.hospitals.neighbour_hospitals
+        )
+        for super_area, hospital_indices in zip(super_areas, neighbours):
+            super_area.closest_hospitals = [
+                self.hospitals.members[index] for index in hospital_indices
+            ]
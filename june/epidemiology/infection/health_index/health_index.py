@@ -1,6 +1,8 @@
+import numba as nb
 import numpy as np
 import pandas as pd
 import yaml
+from functools import lru_cache
 from typing import Optional, List
 
 from june.epidemiology.infection.symptom_tag import SymptomTag
@@ -21,6 +23,67 @@ index_to_maximum_symptoms_tag = {
 
 default_rates_file = paths.data_path / "input/health_index/infection_outcome_rates.csv"
 
+_rate_types = (
+    "asymptomatic",
+    "mild",
+    "hospital",
+    "icu",
+    "home_ifr",
+    "hospital_ifr",
+    "icu_ifr",
+)
+
+
+@nb.jit(nopython=True)
+def _fill_probabilities(probabilities, bin_lefts, bin_rights, rates):
+    """
+    Fill the (max_age + 1, n_outcomes) probability array for one
+    (population, sex) pair from the per-age-bin outcome rates.
+    Both the outcome values and their renormalisation are constant
+    within a bin, so the finished row is computed once per bin and
+    written to every age the bin covers.
+    """
+    for bin_idx in range(len(bin_lefts)):
+        asymptomatic_rate = rates[bin_idx, 0]
+        mild_rate = rates[bin_idx, 1]
+        hospital_rate = rates[bin_idx, 2]
+        icu_rate = rates[bin_idx, 3]
+        home_dead_rate = rates[bin_idx, 4]
+        hospital_dead_rate = rates[bin_idx, 5]
+        icu_dead_rate = rates[bin_idx, 6]
+        severe_rate = max(
+            0.0,
+            1.0 - (hospital_rate + home_dead_rate + asymptomatic_rate + mild_rate),
+        )
+        ward_recovery_rate = hospital_rate - hospital_dead_rate
+        icu_recovery_rate = max(icu_rate - icu_dead_rate, 0.0)
+        home_dead_rate = max(home_dead_rate, 0.0)
+        ward_dead_rate = max(hospital_dead_rate - icu_dead_rate, 0.0)
+        # renormalise all but death rates (since those are the most certain ones)
+        to_keep_sum = home_dead_rate + ward_dead_rate + icu_dead_rate
+        to_adjust_sum = (
+            asymptomatic_rate
+            + mild_rate
+            + severe_rate
+            + ward_recovery_rate
+            + icu_recovery_rate
+        )
+        factor = max(1.0 - to_keep_sum, 0.0) / to_adjust_sum
+        asymptomatic_rate *= factor
+        mild_rate *= factor
+        severe_rate *= factor
+        ward_recovery_rate *= factor
+        icu_recovery_rate *= factor
+        for age in range(bin_lefts[bin_idx], bin_rights[bin_idx] + 1):
+            probabilities[age, 0] = asymptomatic_rate  # recovers as asymptomatic
+            probabilities[age, 1] = mild_rate  # recovers as mild
+            probabilities[age, 2] = severe_rate  # recovers as severe
+            probabilities[age, 3] = ward_recovery_rate  # recovers in the ward
+            probabilities[age, 4] = icu_recovery_rate  # recovers in the icu
+            probabilities[age, 5] = home_dead_rate  # dies at home
+            probabilities[age, 6] = ward_dead_rate  # dies in the ward
+            probabilities[age, 7] = icu_dead_rate  # dies in the icu
+
 
 def _parse_interval(interval):
     age1, age2 = interval.split(",")
@@ -29,7 +92,23 @@ def _parse_interval(interval):
     return pd.Interval(left=age1, right=age2, closed="both")
 
 
+@lru_cache(maxsize=None)
+def _read_rates_df(rates_file: str) -> pd.DataFrame:
+    """
+    Read and parse an outcome rates file, cached per path so repeated
+    generator construction (e.g. in tests) does not re-read the file.
+    """
+    ifrs = pd.read_csv(rates_file, index_col=0)
+    return ifrs.rename(_parse_interval)
+
+
 class HealthIndexGenerator:
+    # integer codes indexing the fused probability tables
+    _POP_CODE = {"ch": 0, "gp": 1}
+    _SEX_CODE = {"m": 0, "f": 1}
+    # upper bound on cached multiplier-adjusted rows (see __init__)
+    _MULTIPLIER_CACHE_MAX_SIZE = 10_000
+
     def __init__(
         self,
         rates_df: pd.DataFrame,
@@ -51,7 +130,26 @@ class HealthIndexGenerator:
         self.care_home_min_age = care_home_min_age
         self.rates_df = rates_df
         self.age_bins = self.rates_df.index
+        # only the bin edges matter to the fill path, so pull them out
+        # of the pd.Interval index into plain int arrays once
+        self._bin_lefts = np.array(
+            [age_bin.left for age_bin in self.age_bins], dtype=np.int64
+        )
+        self._bin_rights = np.array(
+            [age_bin.right for age_bin in self.age_bins], dtype=np.int64
+        )
+        self._rate_cube = self._get_rate_cube()
+        # _get_probabilities allocates _prob_table; the public dict holds
+        # views into it, so both share one contiguous block
         self.probabilities = self._get_probabilities(max_age)
+        self._cum_table = self._get_cumulative_table()
+        # cumulative rows already adjusted by an effective multiplier,
+        # keyed by (population, sex, age, multiplier). Comorbidity and
+        # variant multipliers form a small static set, but an active
+        # vaccination rollout interpolates per-person multipliers day by
+        # day, producing keys that never repeat - hence the size cap,
+        # beyond which rows are computed without being stored.
+        self._multiplier_cum_cache = {}
         self.max_mild_symptom_tag = {
             value: key for key, value in index_to_maximum_symptoms_tag.items()
         }["severe"]
@@ -62,8 +160,8 @@ class HealthIndexGenerator:
         rates_file: str = default_rates_file,
         care_home_min_age=50,
     ):
-        ifrs = pd.read_csv(rates_file, index_col=0)
-        ifrs = ifrs.rename(_parse_interval)
+        # copy so each generator owns its dataframe and cannot mutate the cache
+        ifrs = _read_rates_df(str(rates_file)).copy()
         return cls(
             rates_df=ifrs,
             care_home_min_age=care_home_min_age,
@@ -82,15 +180,58 @@ class HealthIndexGenerator:
             and person.residence.group.spec == "care_home"
             and person.age >= self.care_home_min_age
         ):
-            population = "ch"
+            population = self._POP_CODE["ch"]
         else:
-            population = "gp"
-        probabilities = self.probabilities[population][person.sex][person.age]
+            population = self._POP_CODE["gp"]
+        sex = person.sex_code
         if infection_id is not None:
             effective_multiplier = person.immunity.get_effective_multiplier(infection_id)
             if effective_multiplier != 1.:
-                probabilities = self.apply_effective_multiplier(probabilities, effective_multiplier)
-        return np.cumsum(probabilities)
+                key = (population, sex, person.age, effective_multiplier)
+                try:
+                    return self._multiplier_cum_cache[key]
+                except KeyError:
+                    probabilities = self._prob_table[population, sex, person.age]
+                    probabilities = self.apply_effective_multiplier(
+                        probabilities, effective_multiplier
+                    )
+                    cumulative = np.cumsum(probabilities)
+                    cumulative.setflags(write=False)
+                    if (
+                        len(self._multiplier_cum_cache)
+                        < self._MULTIPLIER_CACHE_MAX_SIZE
+                    ):
+                        self._multiplier_cum_cache[key] = cumulative
+                    return cumulative
+        # probabilities are fixed after construction, so the cumulative
+        # sums are precomputed once and returned without any per-call work
+        return self._cum_table[population, sex, person.age]
+
+    def evaluate_batch(
+        self,
+        ages: np.ndarray,
+        sex_codes: np.ndarray,
+        population_codes: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized counterpart of __call__ for a whole batch of people
+        without effective multipliers: a single fancy-indexing gather
+        into the cumulative table replaces one Python call per person.
+
+        Parameters
+        ----------
+        ages:
+            integer ages, one per person
+        sex_codes:
+            integer sex codes, as defined by _SEX_CODE
+        population_codes:
+            integer population codes, as defined by _POP_CODE
+
+        Returns
+        -------
+        (n_people, 8) matrix of cumulative outcome probabilities
+        """
+        return self._cum_table[population_codes, sex_codes, ages]
 
     def apply_effective_multiplier(self, probabilities, effective_multiplier):
         modified_probabilities = np.zeros_like(probabilities)
@@ -112,68 +253,78 @@ class HealthIndexGenerator:
         )
         return modified_probabilities
 
-    def _set_probability_per_age_bin(self, p, age_bin, sex, population):
-        _sex = _sex_short_to_long[sex]
-        asymptomatic_rate = self.rates_df.loc[
-            age_bin, f"{population}_asymptomatic_{_sex}"
-        ]
-        mild_rate = self.rates_df.loc[age_bin, f"{population}_mild_{_sex}"]
-        hospital_rate = self.rates_df.loc[age_bin, f"{population}_hospital_{_sex}"]
-        icu_rate = self.rates_df.loc[age_bin, f"{population}_icu_{_sex}"]
-        home_dead_rate = self.rates_df.loc[age_bin, f"{population}_home_ifr_{_sex}"]
-        hospital_dead_rate = self.rates_df.loc[
-            age_bin, f"{population}_hospital_ifr_{_sex}"
-        ]
-        icu_dead_rate = self.rates_df.loc[age_bin, f"{population}_icu_ifr_{_sex}"]
-        severe_rate = max(
-            0,
-            1 - (hospital_rate + home_dead_rate + asymptomatic_rate + mild_rate),
+    def _get_cumulative_table(self):
+        """
+        Precompute the cumulative sums of the fused probability table,
+        which __call__ would otherwise recompute per person. The
+        cumulative table is made read-only so callers cannot corrupt
+        it.
+        """
+        cum_table = np.cumsum(self._prob_table, axis=3)
+        cum_table.setflags(write=False)
+        return cum_table
+
+    def _get_rate_cube(self):
+        """
+        Materialize the whole rates table as one contiguous
+        (n_bins, population, sex, rate_type) array, using a single
+        vectorized multi-column conversion per (population, sex) pair
+        instead of per-cell label lookups on the Interval index.
+        """
+        rate_cube = np.empty(
+            (
+                len(self.age_bins),
+                len(self._POP_CODE),
+                len(self._SEX_CODE),
+                len(_rate_types),
+            )
         )
-        # fill each age in bin
-        for age in range(age_bin.left, age_bin.right + 1):
-            p[population][sex][age][0] = asymptomatic_rate  # recovers as asymptomatic
-            p[population][sex][age][1] = mild_rate  # recovers as mild
-            p[population][sex][age][2] = severe_rate  # recovers as severe
-            p[population][sex][age][3] = (
-                hospital_rate - hospital_dead_rate
-            )  # recovers in the ward
-            p[population][sex][age][4] = max(
-                icu_rate - icu_dead_rate, 0
-            )  # recovers in the icu
-            p[population][sex][age][5] = max(home_dead_rate, 0)  # dies at home
-            p[population][sex][age][6] = max(
-                hospital_dead_rate - icu_dead_rate, 0
-            )  # dies in the ward
-            p[population][sex][age][7] = icu_dead_rate
-            # renormalise all but death rates (since those are the most certain ones)
-            total = p[population][sex][age].sum()
-            to_keep_sum = p[population][sex][age][5:].sum()
-            to_adjust_sum = p[population][sex][age][:5].sum()
-            target_adjust_sum = max(1 - to_keep_sum, 0)
-            p[population][sex][age][:5] *= target_adjust_sum / to_adjust_sum
+        for population, population_code in self._POP_CODE.items():
+            for sex, sex_code in self._SEX_CODE.items():
+                _sex = _sex_short_to_long[sex]
+                columns = [
+                    f"{population}_{rate_type}_{_sex}" for rate_type in _rate_types
+                ]
+                rate_cube[:, population_code, sex_code, :] = self.rates_df[
+                    columns
+                ].to_numpy()
+        return rate_cube
 
     def _get_probabilities(self, max_age=99):
         n_outcomes = 8
+        # the nopython fill kernel does no bounds checking, so malformed
+        # age bins must fail loudly here instead of writing out of bounds
+        if len(self._bin_rights) and (
+            self._bin_rights.max() > max_age or self._bin_lefts.min() < 0
+        ):
+            raise ValueError(
+                f"age bins must lie within [0, {max_age}], "
+                f"got [{self._bin_lefts.min()}, {self._bin_rights.max()}] "
+                "in the rates dataframe"
+            )
+        # allocate the fused table once; the nested dict exposes the
+        # per-(population, sex) blocks as views sharing its storage
+        self._prob_table = np.zeros(
+            (len(self._POP_CODE), len(self._SEX_CODE), max_age + 1, n_outcomes)
+        )
         probabilities = {
-            "ch": {
-                "m": np.zeros((max_age + 1, n_outcomes)),
-                "f": np.zeros((max_age + 1, n_outcomes)),
-            },
-            "gp": {
-                "m": np.zeros((max_age + 1, n_outcomes)),
-                "f": np.zeros((max_age + 1, n_outcomes)),
-            },
+            population: {
+                sex: self._prob_table[population_code, sex_code]
+                for sex, sex_code in self._SEX_CODE.items()
+            }
+            for population, population_code in self._POP_CODE.items()
         }
-        for population in ("ch", "gp"):
-            for sex in ["m", "f"]:
+        for population, population_code in self._POP_CODE.items():
+            for sex, sex_code in self._SEX_CODE.items():
                 # values are constant at each bin
-                for age_bin in self.age_bins:
-                    self._set_probability_per_age_bin(
-                        p=probabilities,
-                        age_bin=age_bin,
-                        sex=sex,
-                        population=population,
-                    )
+                _fill_probabilities(
+                    probabilities[population][sex],
+                    self._bin_lefts,
+                    self._bin_rights,
+                    np.ascontiguousarray(
+                        self._rate_cube[:, population_code, sex_code, :]
+                    ),
+                )
         return probabilities
 
 
@@ -108,6 +108,9 @@ class ImmunitySetter:
             )
         else:
             self.comorbidity_prevalence_reference_population = None
+        self._reference_weighted_multipliers = (
+            self._get_reference_weighted_multipliers()
+        )
         self.susceptibility_mode = susceptibility_mode
         self.record = record
 
@@ -162,6 +165,33 @@ class ImmunitySetter:
         if self.vaccination_dict:
             self.set_vaccinations(population)
 
+    def _get_reference_weighted_multipliers(self):
+        """
+        Collapse the comorbidity multipliers and the comorbidity
+        prevalence of the reference population into one weighted
+        multiplier per (sex, age) with a dot product, so the
+        per-person lookup needs no loop over comorbidities.
+        """
+        if (
+            self.multiplier_by_comorbidity is None
+            or self.comorbidity_prevalence_reference_population is None
+        ):
+            return None
+        comorbidities = list(self.comorbidity_prevalence_reference_population)
+        multipliers = np.array(
+            [self.multiplier_by_comorbidity[comorbidity] for comorbidity in comorbidities]
+        )
+        return {
+            sex: multipliers
+            @ np.vstack(
+                [
+                    self.comorbidity_prevalence_reference_population[comorbidity][sex]
+                    for comorbidity in comorbidities
+                ]
+            )
+            for sex in ("m", "f")
+        }
+
     def get_multiplier_from_reference_prevalence(self, age, sex):
         """
         Compute mean comorbidity multiplier given the prevalence of the different comorbidities
@@ -178,26 +208,12 @@ class ImmunitySetter:
             weighted_multiplier:
                 weighted mean of the multipliers given prevalence
         """
-        weighted_multiplier = 0.0
-        for comorbidity in self.comorbidity_prevalence_reference_population.keys():
-            weighted_multiplier += (
-                self.multiplier_by_comorbidity[comorbidity]
-                * self.comorbidity_prevalence_reference_population[comorbidity][sex][
-                    age
-                ]
-            )
-        return weighted_multiplier
+        return self._reference_weighted_multipliers[sex][age]
 
     def get_weighted_multipliers_by_age_sex(
         self,
     ):
-        reference_multipliers = {"m": [], "f": []}
-        for sex in ("m", "f"):
-            for age in range(100):
-                reference_multipliers[sex].append(
-                    self.get_multiplier_from_reference_prevalence(age=age, sex=sex)
-                )
-        return reference_multipliers
+        return self._reference_weighted_multipliers
 
     def set_multipliers(self, population):
         if (
@@ -1,6 +1,9 @@
+import copy
+import math
 import yaml
 import logging
 from enum import IntEnum
+from functools import lru_cache
 from june import paths
 from typing import List, Tuple, Optional
 from random import random
@@ -18,6 +21,25 @@ logger = logging.getLogger("hospitals")
 default_data_filename = paths.data_path / "input/hospitals/trusts.csv"
 default_config_filename = paths.configs_path / "defaults/groups/hospitals.yaml"
 
+# use the libyaml C loader when available, it is much faster than FullLoader
+_yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def _load_config_cached(config_filename: str) -> dict:
+    with open(config_filename) as f:
+        return yaml.load(f, Loader=_yaml_loader)
+
+
+def _load_config(config_filename) -> dict:
+    """
+    Read and parse a hospitals config file, caching the parsed result
+    per path so repeated construction (e.g. in tests) does not re-read
+    the file. A deep copy is returned so callers cannot mutate the
+    cache.
+    """
+    return copy.deepcopy(_load_config_cached(str(config_filename)))
+
 
 class MedicalFacility:
     pass
@@ -27,6 +49,11 @@ class MedicalFacilities:
     pass
 
 
+# bound once at module level to avoid enum attribute lookups per admission
+_hospitalised_tag = SymptomTag.hospitalised
+_intensive_care_tag = SymptomTag.intensive_care
+
+
 class AbstractHospital:
     """
     Hospital functionality common for all hospitals (internal to the domain and external).
@@ -63,14 +90,15 @@ class AbstractHospital:
         - "icu_transferred" : this person has been transferred to icu (from ward)
         - "no_change" : no change respect to last time step.
         """
+        tag = person.infection.tag
         if (
             person.medical_facility is None
             or person.medical_facility.spec != "hospital"
         ):
-            if person.infection.tag.name == "hospitalised":
+            if tag == _hospitalised_tag:
                 self.add_to_ward(person)
                 return "ward_admitted"
-            elif person.infection.tag.name == "intensive_care":
+            elif tag == _intensive_care_tag:
                 self.add_to_icu(person)
                 return "icu_admitted"
             else:
@@ -79,14 +107,14 @@ class AbstractHospital:
                 )
         else:
             # this person has already been allocated in a hospital (this one)
-            if person.infection.tag.name == "hospitalised":
+            if tag == _hospitalised_tag:
                 if person.id in self.ward_ids:
                     return "no_change"
                 else:
                     self.remove_from_icu(person)
                     self.add_to_ward(person)
                     return "ward_transferred"
-            elif person.infection.tag.name == "intensive_care":
+            elif tag == _intensive_care_tag:
                 if person.id in self.icu_ids:
                     return "no_change"
                 else:
@@ -124,7 +152,17 @@ class Hospital(Group, AbstractHospital, MedicalFacility):
         patients = 1
         icu_patients = 2
 
-    __slots__ = "id", "n_beds", "n_icu_beds", "coordinates", "area", "trust_code"
+    __slots__ = (
+        "id",
+        "n_beds",
+        "n_icu_beds",
+        "_coordinates_array",
+        "_coordinates_idx",
+        "area",
+        "trust_code",
+        "_patients_subgroup",
+        "_icu_subgroup",
+    )
 
     def __init__(
         self,
@@ -150,12 +188,31 @@ class Hospital(Group, AbstractHospital, MedicalFacility):
         """
         Group.__init__(self)
         AbstractHospital.__init__(self)
+        # cache the medical subgroups, they are checked on every
+        # allocation attempt and the subgroup objects never change
+        self._patients_subgroup = self.subgroups[self.SubgroupType.patients]
+        self._icu_subgroup = self.subgroups[self.SubgroupType.icu_patients]
         self.area = area
-        self.coordinates = coordinates
+        if coordinates is None:
+            self._coordinates_array = None
+        else:
+            self._coordinates_array = np.asarray(coordinates, dtype=np.float64)
+        self._coordinates_idx = None
         self.n_beds = n_beds
         self.n_icu_beds = n_icu_beds
         self.trust_code = trust_code
 
+    @property
+    def coordinates(self):
+        """
+        Latitude and longitude. Once the hospital is registered in a
+        Hospitals supergroup this is a view into the supergroup's
+        contiguous coordinate array.
+        """
+        if self._coordinates_idx is None:
+            return self._coordinates_array
+        return self._coordinates_array[self._coordinates_idx]
+
     @property
     def super_area(self):
         return self.area.super_area
@@ -173,20 +230,21 @@ class Hospital(Group, AbstractHospital, MedicalFacility):
         """
         Check whether all regular beds are being used
         """
-        return self[self.SubgroupType.patients].size >= self.n_beds
+        return len(self._patients_subgroup.people) >= self.n_beds
 
     @property
     def full_ICU(self):
         """
         Check whether all ICU beds are being used
         """
-        return self[self.SubgroupType.icu_patients].size >= self.n_icu_beds
+        return len(self._icu_subgroup.people) >= self.n_icu_beds
+
+    _MEDICAL_SUBGROUPS = frozenset(
+        (SubgroupType.patients, SubgroupType.icu_patients)
+    )
 
     def add(self, person, subgroup_type=SubgroupType.workers):
-        if subgroup_type in [
-            self.SubgroupType.patients,
-            self.SubgroupType.icu_patients,
-        ]:
+        if subgroup_type in self._MEDICAL_SUBGROUPS:
             super().add(
                 person,
                 activity="medical_facility",
@@ -201,11 +259,11 @@ class Hospital(Group, AbstractHospital, MedicalFacility):
 
     @property
     def ward(self):
-        return self.subgroups[self.SubgroupType.patients]
+        return self._patients_subgroup
 
     @property
     def icu(self):
-        return self.subgroups[self.SubgroupType.icu_patients]
+        return self._icu_subgroup
 
 
 class Hospitals(Supergroup, MedicalFacilities):
@@ -231,9 +289,30 @@ class Hospitals(Supergroup, MedicalFacilities):
         """
         super().__init__(members=hospitals)
         self.neighbour_hospitals = neighbour_hospitals
+        self._n_hospitals = len(hospitals)
+        self._pack_coordinates(hospitals)
         if ball_tree and self.members:
-            coordinates = np.array([hospital.coordinates for hospital in hospitals])
-            self.init_trees(coordinates)
+            self.init_trees(self._coordinates)
+
+    def _pack_coordinates(self, hospitals: List["Hospital"]):
+        """
+        Gather the per-hospital coordinates into one contiguous (N, 2)
+        array and rewire each hospital to view into it, so the tree
+        build is zero-copy and the tiny per-hospital arrays are freed.
+        External hospitals (from other domains) carry no coordinates,
+        so packing is skipped when any member lacks them.
+        """
+        if not hospitals or any(
+            getattr(hospital, "coordinates", None) is None for hospital in hospitals
+        ):
+            self._coordinates = None
+            return
+        self._coordinates = np.array(
+            [hospital.coordinates for hospital in hospitals], dtype=np.float64
+        )
+        for idx, hospital in enumerate(hospitals):
+            hospital._coordinates_array = self._coordinates
+            hospital._coordinates_idx = idx
 
     @classmethod
     def from_file(
@@ -257,11 +336,10 @@ class Hospitals(Supergroup, MedicalFacilities):
         """
 
         hospital_df = pd.read_csv(filename)
-        with open(config_filename) as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
+        config = _load_config(config_filename)
         neighbour_hospitals = config["neighbour_hospitals"]
         logger.info(f"There are {len(hospital_df)} hospitals in the world.")
-        hospitals = cls.init_hospitals(cls, hospital_df)
+        hospitals = cls.create_hospitals_from_df(hospital_df)
         return Hospitals(hospitals, neighbour_hospitals)
 
     @classmethod
@@ -271,83 +349,62 @@ class Hospitals(Supergroup, MedicalFacilities):
         filename: str = default_data_filename,
         config_filename: str = default_config_filename,
     ):
-        with open(config_filename) as f:
-            config = yaml.load(f, Loader=yaml.FullLoader)
+        config = _load_config(config_filename)
         neighbour_hospitals = config["neighbour_hospitals"]
         hospital_df = pd.read_csv(filename, index_col=4)
         area_names = [area.name for area in geography.areas]
         hospital_df = hospital_df.loc[hospital_df.index.isin(area_names)]
         logger.info(f"There are {len(hospital_df)} hospitals in this geography.")
         total_hospitals = len(hospital_df)
+        hospitals_per_area = {
+            area_name: area_df for area_name, area_df in hospital_df.groupby(level=0)
+        }
         hospitals = []
         for area in geography.areas:
-            if area.name in hospital_df.index:
-                hospitals_in_area = hospital_df.loc[area.name]
-                if isinstance(hospitals_in_area, pd.Series):
-                    hospital = cls.create_hospital_from_df_row(
-                        area,
-                        hospitals_in_area,
+            if area.name in hospitals_per_area:
+                hospitals.extend(
+                    cls.create_hospitals_from_df(
+                        hospitals_per_area[area.name], area=area
                     )
-                    hospitals.append(hospital)
-                else:
-                    for _, row in hospitals_in_area.iterrows():
-                        hospital = cls.create_hospital_from_df_row(
-                            area,
-                            row,
-                        )
-                        hospitals.append(hospital)
+                )
                 if len(hospitals) == total_hospitals:
                     break
         return cls(
             hospitals=hospitals, neighbour_hospitals=neighbour_hospitals, ball_tree=True
         )
 
-    @classmethod
-    def create_hospital_from_df_row(
-        cls,
-        area,
-        row,
-    ):
-        coordinates = row[["latitude", "longitude"]].values.astype(np.float64)
-        n_beds = row["beds"]
-        n_icu_beds = row["icu_beds"]
-        trust_code = row["code"]
-        hospital = Hospital(
-            area=area,
-            coordinates=coordinates,
-            n_beds=n_beds,
-            n_icu_beds=n_icu_beds,
-            trust_code=trust_code,
-        )
-        return hospital
-
-    def init_hospitals(
-        self,
+    @staticmethod
+    def create_hospitals_from_df(
         hospital_df: pd.DataFrame,
+        area=None,
     ) -> List["Hospital"]:
         """
         Create Hospital objects with the right characteristics,
-        as given by dataframe.
+        as given by dataframe. Each column is pulled out as a NumPy
+        array once, so no per-row pandas indexing is needed.
 
         Parameters
         ----------
         hospital_df:
             dataframe with hospital characteristics data
+        area:
+            area to assign to all the hospitals in the dataframe
         """
-        hospitals = []
-        for index, row in hospital_df.iterrows():
-            n_beds = row["beds"]
-            n_icu_beds = row["icu_beds"]
-            trust_code = row["code"]
-            coordinates = row[["latitude", "longitude"]].values.astype(np.float64)
-            hospital = Hospital(
-                coordinates=coordinates,
-                n_beds=n_beds,
-                n_icu_beds=n_icu_beds,
-                trust_code=trust_code,
+        latitudes = hospital_df["latitude"].to_numpy(dtype=np.float64)
+        longitudes = hospital_df["longitude"].to_numpy(dtype=np.float64)
+        n_beds = hospital_df["beds"].to_numpy()
+        n_icu_beds = hospital_df["icu_beds"].to_numpy()
+        trust_codes = hospital_df["code"].to_numpy()
+        return [
+            Hospital(
+                area=area,
+                coordinates=np.array((latitudes[i], longitudes[i]), dtype=np.float64),
+                n_beds=int(n_beds[i]),
+                n_icu_beds=int(n_icu_beds[i]),
+                trust_code=trust_codes[i],
             )
-            hospitals.append(hospital)
-        return hospitals
+            for i in range(len(latitudes))
+        ]
 
     def init_trees(self, hospital_coordinates: np.array) -> BallTree:
         """
@@ -363,10 +420,63 @@ class Hospitals(Supergroup, MedicalFacilities):
         -------
         Tree to query nearby schools
         """
+        # convert to radians once and keep them around, so queries that
+        # already have radians at hand can skip the conversion
+        self._coordinates_rad = np.deg2rad(
+            np.asarray(hospital_coordinates, dtype=np.float64)
+        )
         self.hospital_trees = BallTree(
-            np.deg2rad(hospital_coordinates),
+            self._coordinates_rad,
             metric="haversine",
         )
+        # reusable buffer for single-point queries, filled with scalar
+        # math.radians to skip the ufunc and reshape overhead per query
+        self._query_buffer = np.empty((1, 2), dtype=np.float64)
+
+    def get_closest_hospitals_batch(
+        self, coordinates: np.ndarray, k: int
+    ) -> np.ndarray:
+        """
+        Get the k closest hospitals to each of a batch of coordinates.
+        Querying the tree once for many points amortizes the query overhead,
+        so callers on hot paths should accumulate coordinates and use this
+        instead of the single-point variants.
+
+        Parameters
+        ---------
+        coordinates:
+            (n_points, 2) array of latitudes and longitudes
+        k:
+            number of neighbours
+
+        Returns
+        -------
+        (n_points, k) matrix of hospital indices, sorted by distance
+
+        """
+        k = min(k, self._n_hospitals)
+        distances, neighbours = self.hospital_trees.query(
+            np.deg2rad(np.asarray(coordinates, dtype=np.float64)),
+            k=k,
+            sort_results=True,
+        )
+        return neighbours
+
+    def _query_single(self, coordinates: Tuple[float, float], k: int) -> np.ndarray:
+        """
+        Query the tree for one lat/lon pair, converting the two scalars
+        with math.radians into the preallocated buffer instead of
+        allocating a tiny array through np.deg2rad.
+        """
+        self._query_buffer[0, 0] = math.radians(coordinates[0])
+        self._query_buffer[0, 1] = math.radians(coordinates[1])
+        k = min(k, self._n_hospitals)
+        distances, neighbours = self.hospital_trees.query(
+            self._query_buffer,
+            k=k,
+            sort_results=True,
+        )
+        return neighbours[0]
 
     def get_closest_hospitals_idx(
         self, coordinates: Tuple[float, float], k: int
@@ -386,13 +496,7 @@ class Hospitals(Supergroup, MedicalFacilities):
         ID of the k-th closest hospital
 
         """
-        k = min(k, len(list(self.hospital_trees.data)))
-        distances, neighbours = self.hospital_trees.query(
-            np.deg2rad(coordinates.reshape(1, -1)),
-            k=k,
-            sort_results=True,
-        )
-        return neighbours[0]
+        return self._query_single(coordinates, k=k)
 
     def get_closest_hospitals(
         self, coordinates: Tuple[float, float], k: int
@@ -412,13 +516,7 @@ class Hospitals(Supergroup, MedicalFacilities):
         ID of the k-th closest hospital
 
         """
-        k = min(k, len(list(self.hospital_trees.data)))
-        distances, neighbours = self.hospital_trees.query(
-            np.deg2rad(coordinates.reshape(1, -1)),
-            k=k,
-            sort_results=True,
-        )
-        return [self.members[index] for index in neighbours[0]]
+        return [self.members[index] for index in self._query_single(coordinates, k=k)]
 
 
 class ExternalHospital(ExternalGroup, AbstractHospital):
@@ -54,7 +54,7 @@ def save_hospitals_to_hdf5(
                     region_names.append(hospital.region_name)
                 n_beds.append(hospital.n_beds)
                 n_icu_beds.append(hospital.n_icu_beds)
-                coordinates.append(np.array(hospital.coordinates))
+                coordinates.append(hospital.coordinates)
                 trust_code.append(hospital.trust_code)
 
             ids = np.array(ids, dtype=np.int64)
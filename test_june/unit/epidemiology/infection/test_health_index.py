@@ -29,6 +29,20 @@ class TestHealthIndex:
                     assert all(probs >= 0)
                     assert sum(probs) == pytest.approx(1, rel=1.0e-2)
 
+    def test__evaluate_batch_matches_call(self, health_index):
+        ages = np.array([5, 27, 60, 99])
+        sexes = ("m", "f", "m", "f")
+        sex_codes = np.array([0, 1, 0, 1])
+        # people without a residence resolve to the general population
+        population_codes = np.ones(len(ages), dtype=int)
+        batch = health_index.evaluate_batch(ages, sex_codes, population_codes)
+        assert batch.shape == (len(ages), 8)
+        for i, (age, sex) in enumerate(zip(ages, sexes)):
+            person = Person.from_attributes(sex=sex, age=int(age))
+            np.testing.assert_allclose(
+                batch[i], health_index(person, infection_id=None)
+            )
+
 
 class TestMultipliers:
 
@@ -41,6 +41,16 @@ def test__given_hospital_finds_itself_as_closest(hospitals, hospitals_df, index)
     assert hospitals.members[closest_hospital_idx] == hospitals.members[index]
 
 
+def test__batch_query_matches_single_queries(hospitals, hospitals_df):
+    coordinates = hospitals_df[["latitude", "longitude"]].iloc[:5].values
+    neighbours = hospitals.get_closest_hospitals_batch(coordinates, k=3)
+    assert neighbours.shape == (len(coordinates), 3)
+    for coordinate, row in zip(coordinates, neighbours):
+        np.testing.assert_array_equal(
+            row, hospitals.get_closest_hospitals_idx(coordinate, k=3)
+        )
+
+
 @pytest.fixture(name="selector", scope="module")
 def create_selector():
     selector = InfectionSelector.from_file()